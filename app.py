@@ -1,31 +1,282 @@
 # app.py - Production VaultKeeper Claude Integration
+# Patch the stdlib before requests is imported so socket waits yield to
+# other greenlets under gunicorn's gevent workers
+from gevent import monkey
+monkey.patch_all()
+
 import os
+import atexit
+import hashlib
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+import orjson
 import requests
-from flask import Flask, request, jsonify
-from dataclasses import dataclass
-
-# Configure production logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from requests.adapters import HTTPAdapter
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
+from flask.typing import ResponseReturnValue
+from dataclasses import dataclass, asdict, replace
+from celery import Celery
+from celery.result import AsyncResult
+from cachetools import TTLCache
+from pydantic import BaseModel, ValidationError
+from ulid import ULID
+from tenacity import RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that hands records off unformatted and never blocks"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: leave formatting to the listener thread
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+# Configure production logging: request threads only enqueue records; a
+# single listener thread formats and writes them
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=10000)
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[_DroppingQueueHandler(_log_queue)])
 logger = logging.getLogger('VaultKeeperClaude')
 
 # Environment configuration
-ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY')
+ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
 PORT = int(os.environ.get('PORT', 5000))
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+# Keep-alive connections to the Claude API per session
+CLAUDE_POOL_MAXSIZE = int(os.environ.get('CLAUDE_POOL_MAXSIZE', 64))
 
 if not ANTHROPIC_API_KEY:
     logger.error("ANTHROPIC_API_KEY not set!")
     raise ValueError("ANTHROPIC_API_KEY environment variable is required")
 
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for request parsing and jsonify"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Background workers for queued Claude tasks. Run with:
+#   celery -A app.celery worker -Q high,default
+celery = Celery('vk', broker=REDIS_URL, backend=REDIS_URL)
+celery.conf.task_default_queue = 'default'
+
+# Agents whose queued tasks skip ahead of general traffic
+HIGH_PRIORITY_AGENTS = {"PatentAI", "CFOAI"}
+
+def _create_pooled_session() -> requests.Session:
+    """Create a keep-alive session so Claude calls reuse TCP/TLS connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=CLAUDE_POOL_MAXSIZE,
+        # A gevent worker runs up to --worker-connections greenlets; past the
+        # pool size they wait for a free connection instead of opening
+        # throwaway ones that urllib3 would discard
+        pool_block=True,
+        # No urllib3 retries: tenacity retries Claude calls (honouring
+        # Retry-After), and connect retries here would run inside each of
+        # its attempts and multiply with them
+        max_retries=0
+    )
+    session.mount("https://", adapter)
+    return session
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+def _is_retryable_error(exc: BaseException) -> bool:
+    """Timeouts, connection failures and transient Claude API statuses"""
+    if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    return (
+        isinstance(exc, requests.exceptions.HTTPError)
+        and exc.response is not None
+        and exc.response.status_code in RETRYABLE_STATUS_CODES
+    )
+
+_backoff_wait = wait_exponential_jitter(initial=0.5, max=8)
+
+def _retry_after_wait(retry_state: RetryCallState) -> float:
+    """Wait as long as the API's Retry-After header asks, else back off with jitter"""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(exc, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), 30.0)
+        except ValueError:
+            pass
+        # Retry-After may also be an HTTP-date
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None and retry_at.tzinfo is not None:
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            return min(max(delay, 0.0), 30.0)
+    return _backoff_wait(retry_state)
+
+# Shared session for health checks
+health_session = _create_pooled_session()
+HEALTH_PROBE_INTERVAL = 30
+
+# Messages API model and per-task output budget
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+CLAUDE_MAX_TOKENS = 2000
+
+# Static prompt prefix shared by every task. Kept stable and sent first so
+# Anthropic prompt caching can reuse it across requests.
+SYSTEM_CONTEXT = """You are Claude, operating as a trusted AI agent within the VaultKeeper ecosystem. You work alongside:
+
+- Monique (CEO): Strategic oversight, workflow orchestration, high-level decision making
+- VaultKeeper: File storage, hash logging, IP verification, security management  
+- Coordinator AI: File rotation, workspace management, system organization
+- Patent AI: Patent analysis, claim generation, prior art research, IP strategy
+- CFO AI: Financial analysis, IP valuation, investment decisions, cost optimization
+
+Your role is to provide expert analysis, recommendations, and decision support that integrates seamlessly with the multi-agent workflow.
+
+Please provide a structured response in JSON format with:
+1. "executive_summary": Brief overview for leadership and agent coordination
+2. "detailed_analysis": Comprehensive findings and technical insights
+3. "recommendations": Specific, actionable next steps prioritized by importance
+4. "agent_handoffs": Tasks or information to delegate to other specific agents
+5. "risk_assessment": Potential issues, conflicts, or concerns identified
+6. "success_metrics": How to measure successful completion of recommendations
+7. "timeline": Suggested implementation timeline with milestones
+
+Ensure your response is actionable, technically accurate, and optimized for autonomous agent coordination."""
+
+AGENT_SPECIFIC_CONTEXT = MappingProxyType({
+    "Monique": "Focus on strategic insights, executive summaries, and high-level recommendations for CEO decision-making.",
+    "CoordinatorAI": "Emphasize file organization, system efficiency, and workflow optimization.",
+    "PatentAI": "Provide detailed technical analysis, prior art insights, and IP strategy recommendations.",
+    "CFOAI": "Focus on financial implications, cost-benefit analysis, and investment guidance.",
+    "VaultKeeper": "Address security, compliance, and data integrity considerations."
+})
+
+DEFAULT_GUIDANCE = "Provide comprehensive analysis suited for multi-agent coordination."
+
+def _build_system_blocks(context_guidance: str) -> List[Dict[str, Any]]:
+    """Build the cacheable system prefix for one agent's guidance"""
+    return [
+        {"type": "text", "text": SYSTEM_CONTEXT},
+        {
+            "type": "text",
+            "text": f"AGENT-SPECIFIC GUIDANCE:\n{context_guidance}",
+            "cache_control": {"type": "ephemeral"}
+        }
+    ]
+
+# Built once at import; shared read-only by every payload
+AGENT_SYSTEM_BLOCKS = MappingProxyType({
+    agent_name: _build_system_blocks(guidance)
+    for agent_name, guidance in AGENT_SPECIFIC_CONTEXT.items()
+})
+DEFAULT_SYSTEM_BLOCKS = _build_system_blocks(DEFAULT_GUIDANCE)
+
+# Agent endpoint path key -> (agent_name, verb, default task_type, priority, context)
+# Each entry is served at POST /claude/<path key>/<verb> and /claude/<path key>/stream
+AGENT_ROUTES = MappingProxyType({
+    "monique": ("Monique", "delegate", "strategic_analysis", "high", "CEO strategic delegation"),
+    "coordinator": ("CoordinatorAI", "handoff", "file_management", "medium", "File organization and workspace management"),
+    "patent": ("PatentAI", "collaborate", "patent_analysis", "high", "Patent analysis and IP strategy"),
+    "cfo": ("CFOAI", "consult", "financial_analysis", "high", "Financial analysis and IP valuation")
+})
+
+# Low-priority tasks arriving within this window are sent to Claude together
+COALESCE_MAX_BATCH = 8
+COALESCE_WINDOW_SECONDS = 0.25
+# Coalescer shared by agent names without their own system prompt
+DEFAULT_COALESCER = "default"
+
+COALESCED_TASK_PREAMBLE = """You will receive {count} independent tasks, each starting with a line "=== TASK n ===". Answer every task on its own, following the response format above.
+
+Respond with ONLY a JSON array of exactly {count} elements, where element n is the complete JSON response object for TASK n. Do not include any text outside the array."""
+
+_json_decoder = json.JSONDecoder()
 
-@dataclass
+def _split_json_array(text: str) -> List[str]:
+    """Split a JSON array into the verbatim source text of each element
+    
+    Raises ValueError if ``text`` isn't a single well-formed JSON array.
+    """
+    text = text.strip()
+    if not text.startswith("["):
+        raise ValueError("expected a JSON array")
+    
+    elements: List[str] = []
+    index = 1
+    while True:
+        while index < len(text) and text[index].isspace():
+            index += 1
+        if text.startswith("]", index) and not elements:
+            index += 1
+            break
+        
+        _, end = _json_decoder.raw_decode(text, index)
+        elements.append(text[index:end])
+        
+        while end < len(text) and text[end].isspace():
+            end += 1
+        if text.startswith(",", end):
+            index = end + 1
+        elif text.startswith("]", end):
+            index = end + 1
+            break
+        else:
+            raise ValueError(f"expected ',' or ']' at position {end}")
+    
+    if text[index:].strip():
+        raise ValueError("unexpected text after the JSON array")
+    return elements
+
+def _content_json(content: Dict[str, Any], sort_keys: bool = False, indent: bool = False) -> str:
+    """Serialize task content with orjson, falling back to json for integers past 64 bits"""
+    option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        return orjson.dumps(content, option=option).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            content,
+            sort_keys=sort_keys,
+            indent=2 if indent else None,
+            separators=None if indent else (',', ':'),
+            ensure_ascii=False
+        )
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event frame"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+@dataclass(slots=True, frozen=True)
 class AgentTask:
     """Standardized task structure for all agents"""
     agent_name: str
@@ -35,130 +286,519 @@ class AgentTask:
     priority: str = "medium"
     context: str = ""
 
+class TaskRequest(BaseModel):
+    """Validated request body for the agent endpoints"""
+    task_type: str = "analysis"
+    content: Dict[str, Any] = {}
+    task_id: Optional[str] = None
+    priority: str = "medium"
+    context: str = ""
+    mode: Optional[str] = None
+
+class BatchTaskRequest(TaskRequest):
+    """One task in a /claude/batch/process body"""
+    agent_name: str = "BatchProcessor"
+
+class BatchRequest(BaseModel):
+    """Validated request body for /claude/batch/process"""
+    tasks: List[BatchTaskRequest] = []
+    mode: Optional[str] = None
+
+def _build_agent_task(req: TaskRequest, agent_name: str, **defaults: str) -> AgentTask:
+    """Create an AgentTask, using the endpoint's defaults for fields the caller omitted"""
+    fields = req.model_dump(exclude={'mode', 'agent_name'})
+    for name, default in defaults.items():
+        if name not in req.model_fields_set:
+            fields[name] = default
+    return AgentTask(agent_name=agent_name, **fields)
+
+class Coalescer:
+    """Micro-batcher that merges near-simultaneous tasks sharing a system prompt
+    
+    Waits up to ``window`` seconds (or until ``max_batch`` tasks arrive) and
+    answers the whole group with a single Claude call.
+    """
+    
+    def __init__(self, service: "ProductionClaudeService", agent_name: str,
+                 max_batch: int = COALESCE_MAX_BATCH, window: float = COALESCE_WINDOW_SECONDS) -> None:
+        self.service = service
+        self.agent_name = agent_name
+        self.max_batch = max_batch
+        self.window = window
+        self.pending: "queue.Queue[Tuple[AgentTask, Future]]" = queue.Queue()
+        self.thread = threading.Thread(
+            target=self._collect_loop,
+            name=f"coalescer-{agent_name}",
+            daemon=True
+        )
+        self.thread.start()
+    
+    def submit(self, task: AgentTask) -> Dict[str, Any]:
+        """Queue a task and block until its result is available
+        
+        Tasks left alone in their window, or whose coalesced reply couldn't be
+        parsed, are run individually on the caller's own thread.
+        """
+        future: Future = Future()
+        self.pending.put((task, future))
+        result = future.result()
+        return result if result is not None else self.service._run_task(task)
+    
+    def _collect_loop(self) -> None:
+        """Gather tasks into windows and hand each window off for dispatch"""
+        while True:
+            items = [self.pending.get()]
+            deadline = time.monotonic() + self.window
+            
+            while len(items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self.pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            if len(items) == 1:
+                items[0][1].set_result(None)
+            else:
+                self.service.coalesce_executor.submit(self._dispatch, items)
+    
+    def _dispatch(self, items: List[Tuple[AgentTask, Future]]) -> None:
+        """Run one window of tasks and resolve each caller's future"""
+        tasks = [task for task, _ in items]
+        
+        try:
+            results: List[Optional[Dict[str, Any]]] = list(self.service._run_coalesced(tasks))
+        except ValueError as e:
+            # Claude answered but not in the agreed shape; retry each task alone
+            logger.warning("Coalesced reply for %d %s tasks unusable, running individually: %s", len(tasks), self.agent_name, e)
+            results = [None] * len(tasks)
+        except Exception as e:
+            # The call itself failed (already retried); re-running each task
+            # would only multiply load on a struggling or rate-limited API
+            logger.error("Coalesced call for %d %s tasks failed: %s", len(tasks), self.agent_name, e)
+            message = self.service._error_message(e)
+            results = [self.service._create_error_response(task, message) for task in tasks]
+        
+        for (_, future), result in zip(items, results):
+            future.set_result(result)
+
 class ProductionClaudeService:
     """Production-ready Claude integration service"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.api_key = ANTHROPIC_API_KEY
         self.base_url = "https://api.anthropic.com/v1/messages"
+        self.batches_url = "https://api.anthropic.com/v1/messages/batches"
+        self.batch_headers = {"anthropic-beta": "message-batches-2024-09-24"}
         self.headers = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01"
         }
-        self.task_counter = 0
+        self.session = _create_pooled_session()
+        self.session.headers.update(self.headers)
+        # Static part of every Messages API payload, per agent: streamed
+        # calls and Message Batches requests (which can't stream) each get one
+        self._payload_skeletons = {
+            agent_name: self._create_payload_skeleton(system_blocks)
+            for agent_name, system_blocks in AGENT_SYSTEM_BLOCKS.items()
+        }
+        self._stream_payload_skeletons = {
+            agent_name: self._create_payload_skeleton(system_blocks, stream=True)
+            for agent_name, system_blocks in AGENT_SYSTEM_BLOCKS.items()
+        }
+        self._default_payload_skeleton = self._create_payload_skeleton(DEFAULT_SYSTEM_BLOCKS)
+        self._default_stream_payload_skeleton = self._create_payload_skeleton(DEFAULT_SYSTEM_BLOCKS, stream=True)
+        # Completed results keyed on task inputs, for retries and duplicate handoffs
+        self.cache: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=2048, ttl=600)
+        self.cache_lock = threading.Lock()
+        # Latest result of the background Claude API probe behind /health
+        # "ok" is None until the first probe finishes
+        self._claude_health: Dict[str, Any] = {"ok": None, "ts": None}
+        self._health_lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+        # Per-agent micro-batchers for non-high-priority tasks
+        self.coalescers: Dict[str, Coalescer] = {}
+        self.coalescer_lock = threading.Lock()
+        self.coalesce_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="coalesce")
         logger.info("Production Claude Service initialized successfully")
     
-    def process_agent_task(self, task: AgentTask) -> Dict[str, Any]:
+    def process_agent_task(self, task: AgentTask, use_cache: bool = True) -> Dict[str, Any]:
         """Process agent task with Claude AI"""
         
-        # Generate task ID if not provided
-        if not task.task_id:
-            self.task_counter += 1
-            task.task_id = f"{task.agent_name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{self.task_counter:03d}"
+        task = self.ensure_task_id(task)
         
-        # Create VaultKeeper-specific prompt
-        prompt = self._create_vaultkeeper_prompt(task)
+        cache_key = self._cache_key(task)
+        cached = self._get_cached(task, cache_key) if use_cache else None
+        if cached is not None:
+            return cached
         
-        payload = {
-            "model": "claude-sonnet-4-20250514",
-            "max_tokens": 2000,
-            "messages": [{"role": "user", "content": prompt}]
-        }
+        # Interactive (high priority) tasks skip the coalescing delay
+        if task.priority == "high":
+            result = self._run_task(task)
+        else:
+            result = self._get_coalescer(task.agent_name).submit(task)
+        
+        if result["status"] == "completed":
+            with self.cache_lock:
+                self.cache[cache_key] = result
+        
+        return result
+    
+    def _run_task(self, task: AgentTask) -> Dict[str, Any]:
+        """Send a single task to Claude"""
+        payload = self._build_payload(task, stream=True)
         
         try:
-            logger.info(f"Processing task {task.task_id} from {task.agent_name}")
+            logger.info("Processing task %s from %s", task.task_id, task.agent_name)
             
-            # Make API call with timeout
-            response = requests.post(
-                self.base_url, 
-                headers=self.headers,
-                json=payload,
-                timeout=45
-            )
+            # Collect the streamed reply; shares the code path with /stream
+            usage: Dict[str, int] = {}
+            claude_analysis = "".join(self._stream_text(payload, usage))
             
-            response.raise_for_status()
+            result = self._build_result(task, claude_analysis, usage)
             
-            # Parse Claude response
-            claude_data = response.json()
-            claude_analysis = claude_data['content'][0]['text']
+            logger.debug("Task %s completed successfully", task.task_id)
+            return result
             
-            # Structure response for agents
-            result = {
-                "task_id": task.task_id,
-                "status": "completed",
-                "agent": task.agent_name,
-                "task_type": task.task_type,
-                "claude_analysis": claude_analysis,
-                "timestamp": datetime.utcnow().isoformat(),
-                "tokens_used": claude_data.get('usage', {}).get('input_tokens', 0) + claude_data.get('usage', {}).get('output_tokens', 0)
-            }
+        except Exception as e:
+            logger.error("Task %s failed: %s", task.task_id, e)
+            return self._create_error_response(task, self._error_message(e))
+    
+    def _run_coalesced(self, tasks: List[AgentTask]) -> List[Dict[str, Any]]:
+        """Answer several tasks that share a system prompt with one Claude call
+        
+        Each result carries Claude's verbatim text for its task, like a single
+        task would. Raises ValueError if the reply isn't a JSON array with one
+        answer per task, so the caller can fall back to individual calls.
+        """
+        sections = [
+            f"=== TASK {index} ===\n{self._create_vaultkeeper_prompt(task)}"
+            for index, task in enumerate(tasks, 1)
+        ]
+        user_content = COALESCED_TASK_PREAMBLE.format(count=len(tasks)) + "\n\n" + "\n\n".join(sections)
+        
+        payload = {
+            **self._get_payload_skeleton(tasks[0].agent_name, stream=True),
+            "max_tokens": CLAUDE_MAX_TOKENS * len(tasks),
+            "messages": [{"role": "user", "content": user_content}]
+        }
+        
+        logger.info("Processing %d coalesced tasks from %s", len(tasks), tasks[0].agent_name)
+        
+        usage: Dict[str, int] = {}
+        text = "".join(self._stream_text(payload, usage)).strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+        
+        answers = _split_json_array(text)
+        if len(answers) != len(tasks):
+            raise ValueError(f"expected a JSON array of {len(tasks)} answers, got {len(answers)}")
+        
+        # Per-task usage isn't reported for a shared call; an even share of it
+        # is returned as an estimate rather than as tokens_used
+        tokens_estimated = (usage.get('input_tokens', 0) + usage.get('output_tokens', 0)) // len(tasks)
+        
+        now_iso = datetime.now(timezone.utc).isoformat()
+        results = []
+        for task, answer in zip(tasks, answers):
+            claude_analysis = orjson.loads(answer) if answer.startswith('"') else answer
+            result = self._build_result(task, claude_analysis, {}, now_iso)
+            del result["tokens_used"]
+            results.append({**result, "tokens_used_estimated": tokens_estimated, "coalesced": len(tasks)})
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Coalesced tasks %s completed successfully", ", ".join(str(task.task_id) for task in tasks))
+        return results
+    
+    def _get_coalescer(self, agent_name: str) -> Coalescer:
+        """Return the agent's coalescer, creating it on first use
+        
+        Agent names come from request bodies, so only the known agents get
+        their own coalescer (and thread); all others share the default one,
+        as they share the default system prompt.
+        """
+        if agent_name not in AGENT_SYSTEM_BLOCKS:
+            agent_name = DEFAULT_COALESCER
+        coalescer = self.coalescers.get(agent_name)
+        if coalescer is None:
+            with self.coalescer_lock:
+                coalescer = self.coalescers.get(agent_name)
+                if coalescer is None:
+                    coalescer = self.coalescers[agent_name] = Coalescer(self, agent_name)
+        return coalescer
+    
+    def stream_agent_task(self, task: AgentTask, use_cache: bool = True) -> Iterator[str]:
+        """Process agent task, yielding SSE frames as Claude generates text
+        
+        Emits ``delta`` events with text chunks, then a ``done`` event carrying
+        the standard task response (or an ``error`` event).
+        """
+        task = self.ensure_task_id(task)
+        
+        cache_key = self._cache_key(task)
+        cached = self._get_cached(task, cache_key) if use_cache else None
+        if cached is not None:
+            yield _sse("delta", {"task_id": task.task_id, "text": cached["claude_analysis"]})
+            yield _sse("done", cached)
+            return
+        
+        payload = self._build_payload(task, stream=True)
+        
+        try:
+            logger.info("Streaming task %s from %s", task.task_id, task.agent_name)
             
-            logger.info(f"Task {task.task_id} completed successfully")
-            return result
+            usage: Dict[str, int] = {}
+            parts = []
+            for text in self._stream_text(payload, usage):
+                parts.append(text)
+                yield _sse("delta", {"task_id": task.task_id, "text": text})
+            
+            result = self._build_result(task, "".join(parts), usage)
             
-        except requests.exceptions.Timeout:
-            logger.error(f"Task {task.task_id} timed out")
-            return self._create_error_response(task, "Request timeout - Claude API took too long")
+            with self.cache_lock:
+                self.cache[cache_key] = result
             
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"Task {task.task_id} HTTP error: {e}")
-            return self._create_error_response(task, f"HTTP Error: {e}")
+            logger.debug("Task %s stream completed successfully", task.task_id)
+            yield _sse("done", result)
             
         except Exception as e:
-            logger.error(f"Task {task.task_id} unexpected error: {e}")
-            return self._create_error_response(task, f"Unexpected error: {str(e)}")
+            logger.error("Task %s stream error: %s", task.task_id, e)
+            yield _sse("error", self._create_error_response(task, self._error_message(e)))
     
-    def _create_vaultkeeper_prompt(self, task: AgentTask) -> str:
-        """Create specialized prompt for VaultKeeper ecosystem"""
+    @retry(
+        retry=retry_if_exception(_is_retryable_error),
+        wait=_retry_after_wait,
+        stop=stop_after_attempt(4),
+        reraise=True
+    )
+    def _open_stream(self, payload: Dict[str, Any]) -> requests.Response:
+        """POST a streaming Messages API request, retrying transient failures
         
-        system_context = f"""You are Claude, operating as a trusted AI agent within the VaultKeeper ecosystem. You work alongside:
-
-- Monique (CEO): Strategic oversight, workflow orchestration, high-level decision making
-- VaultKeeper: File storage, hash logging, IP verification, security management  
-- Coordinator AI: File rotation, workspace management, system organization
-- Patent AI: Patent analysis, claim generation, prior art research, IP strategy
-- CFO AI: Financial analysis, IP valuation, investment decisions, cost optimization
-
-Your role is to provide expert analysis, recommendations, and decision support that integrates seamlessly with the multi-agent workflow."""
-
-        agent_specific_context = {
-            "Monique": "Focus on strategic insights, executive summaries, and high-level recommendations for CEO decision-making.",
-            "CoordinatorAI": "Emphasize file organization, system efficiency, and workflow optimization.",
-            "PatentAI": "Provide detailed technical analysis, prior art insights, and IP strategy recommendations.",
-            "CFOAI": "Focus on financial implications, cost-benefit analysis, and investment guidance.",
-            "VaultKeeper": "Address security, compliance, and data integrity considerations."
-        }
+        ``payload`` must be built from a streaming skeleton.
+        """
+        response = self.session.post(
+            self.base_url,
+            data=orjson.dumps(payload),
+            stream=True,
+            timeout=(5, 45)
+        )
+        
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        
+        return response
+    
+    def _stream_text(self, payload: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        """Call the Messages API with SSE streaming and yield text deltas
+        
+        Token usage from the stream is accumulated into ``usage``.
+        """
+        with self._open_stream(payload) as response:
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                
+                event = orjson.loads(line[6:])
+                event_type = event.get('type')
+                
+                if event_type == 'content_block_delta' and event['delta'].get('type') == 'text_delta':
+                    yield event['delta']['text']
+                elif event_type == 'message_start':
+                    usage.update(event['message'].get('usage', {}))
+                elif event_type == 'message_delta':
+                    usage.update(event.get('usage', {}))
+                elif event_type == 'error':
+                    raise RuntimeError(f"Claude stream error: {event['error'].get('message')}")
+    
+    def submit_message_batch(self, tasks: List[AgentTask]) -> Dict[str, Any]:
+        """Submit tasks to the Anthropic Message Batches API (async, discounted)"""
+        batch_requests = []
+        for task in tasks:
+            task = self.ensure_task_id(task)
+            batch_requests.append({"custom_id": task.task_id, "params": self._build_payload(task)})
         
-        context_guidance = agent_specific_context.get(
-            task.agent_name, 
-            "Provide comprehensive analysis suited for multi-agent coordination."
+        logger.info("Submitting message batch with %d tasks", len(batch_requests))
+        response = self.session.post(
+            self.batches_url,
+            headers=self.batch_headers,
+            data=orjson.dumps({"requests": batch_requests}),
+            timeout=(5, 60)
         )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def get_message_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Fetch the processing status of a submitted message batch"""
+        response = self.session.get(
+            f"{self.batches_url}/{batch_id}",
+            headers=self.batch_headers,
+            timeout=(5, 30)
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def open_message_batch_results(self, results_url: str) -> requests.Response:
+        """Open the JSONL results of an ended message batch for streaming
+        
+        Raises before any body is read if the results request failed.
+        """
+        response = self.session.get(
+            results_url,
+            headers=self.batch_headers,
+            stream=True,
+            timeout=(5, 60)
+        )
+        
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        
+        return response
+    
+    def iter_message_batch_results(self, response: requests.Response) -> Iterator[bytes]:
+        """Yield the non-empty JSONL lines of an opened results response"""
+        with response:
+            for line in response.iter_lines():
+                if line:
+                    yield line
+    
+    def get_claude_health(self) -> Dict[str, Any]:
+        """Return the latest Claude API probe result, starting the probe on first use"""
+        if self._health_thread is None:
+            with self._health_lock:
+                if self._health_thread is None:
+                    self._health_thread = threading.Thread(
+                        target=self._health_probe_loop,
+                        name="claude-health-probe",
+                        daemon=True
+                    )
+                    self._health_thread.start()
+        return self._claude_health
+    
+    def _health_probe_loop(self) -> None:
+        """Refresh the cached Claude API health every HEALTH_PROBE_INTERVAL seconds"""
+        while True:
+            self._probe_claude()
+            time.sleep(HEALTH_PROBE_INTERVAL)
+    
+    def _probe_claude(self) -> None:
+        """Send a minimal ping to the Claude API and record whether it succeeded"""
+        test_payload = {
+            "model": CLAUDE_MODEL,
+            "max_tokens": 10,
+            "messages": [{"role": "user", "content": "ping"}]
+        }
         
-        return f"""{system_context}
+        try:
+            test_response = health_session.post(
+                self.base_url,
+                headers=self.headers,
+                data=orjson.dumps(test_payload),
+                timeout=(5, 10)
+            )
+            claude_healthy = test_response.status_code == 200
+            
+        except Exception as e:
+            claude_healthy = False
+            logger.warning("Claude API health check failed: %s", e)
+        
+        self._claude_health = {"ok": claude_healthy, "ts": time.time()}
+    
+    def ensure_task_id(self, task: AgentTask) -> AgentTask:
+        """Return the task with a generated ID if it wasn't given one"""
+        if task.task_id:
+            return task
+        # ULIDs sort by creation time and stay unique across workers
+        return replace(task, task_id=f"{task.agent_name}_{ULID()}")
+    
+    def _get_cached(self, task: AgentTask, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result re-labelled for this task, if any"""
+        with self.cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        logger.debug("Task %s served from cache", task.task_id)
+        return {**cached, "task_id": task.task_id, "cache": "hit"}
+    
+    def _build_result(self, task: AgentTask, claude_analysis: str, usage: Dict[str, int],
+                      timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Structure a completed Claude response for agents"""
+        return {
+            "task_id": task.task_id,
+            "status": "completed",
+            "agent": task.agent_name,
+            "task_type": task.task_type,
+            "claude_analysis": claude_analysis,
+            "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+            "tokens_used": usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+        }
+    
+    def _cache_key(self, task: AgentTask) -> str:
+        """Hash the task inputs that determine Claude's response"""
+        # A JSON array is self-delimiting, so no field can bleed into the next
+        raw = orjson.dumps([task.agent_name, task.task_type, task.priority, task.context])
+        raw += _content_json(task.content, sort_keys=True).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    def _create_payload_skeleton(self, system_blocks: List[Dict[str, Any]],
+                                 stream: bool = False) -> Dict[str, Any]:
+        """Payload fields that don't vary between tasks for the same agent"""
+        skeleton = {
+            "model": CLAUDE_MODEL,
+            "max_tokens": CLAUDE_MAX_TOKENS,
+            "system": system_blocks
+        }
+        if stream:
+            skeleton["stream"] = True
+        return skeleton
+    
+    def _get_payload_skeleton(self, agent_name: str, stream: bool = False) -> Dict[str, Any]:
+        """Return the agent's prebuilt payload skeleton"""
+        if stream:
+            return self._stream_payload_skeletons.get(agent_name, self._default_stream_payload_skeleton)
+        return self._payload_skeletons.get(agent_name, self._default_payload_skeleton)
+    
+    def _build_payload(self, task: AgentTask, stream: bool = False) -> Dict[str, Any]:
+        """Build the Messages API payload for a task"""
+        # Create VaultKeeper-specific prompt
+        user_content = self._create_vaultkeeper_prompt(task)
+        skeleton = self._get_payload_skeleton(task.agent_name, stream)
+        
+        return {**skeleton, "messages": [{"role": "user", "content": user_content}]}
+    
+    def _create_vaultkeeper_prompt(self, task: AgentTask) -> str:
+        """Create specialized prompt for VaultKeeper ecosystem
 
-CURRENT TASK:
+        Returns the per-task user message; the cacheable system blocks come
+        from the agent's payload skeleton.
+        """
+        user_content = f"""CURRENT TASK:
 - Requesting Agent: {task.agent_name}
 - Task Type: {task.task_type}
 - Priority: {task.priority}
 - Context: {task.context}
 
-AGENT-SPECIFIC GUIDANCE:
-{context_guidance}
-
 TASK CONTENT:
-{json.dumps(task.content, indent=2)}
+{_content_json(task.content, indent=True)}"""
 
-Please provide a structured response in JSON format with:
-1. "executive_summary": Brief overview for leadership and agent coordination
-2. "detailed_analysis": Comprehensive findings and technical insights
-3. "recommendations": Specific, actionable next steps prioritized by importance
-4. "agent_handoffs": Tasks or information to delegate to other specific agents
-5. "risk_assessment": Potential issues, conflicts, or concerns identified
-6. "success_metrics": How to measure successful completion of recommendations
-7. "timeline": Suggested implementation timeline with milestones
+        return user_content
 
-Ensure your response is actionable, technically accurate, and optimized for autonomous agent coordination."""
+    def _error_message(self, exc: Exception) -> str:
+        """Describe a failed Claude call for an error response"""
+        if isinstance(exc, requests.exceptions.Timeout):
+            return "Request timeout - Claude API took too long"
+        if isinstance(exc, requests.exceptions.HTTPError):
+            return f"HTTP Error: {exc}"
+        return f"Unexpected error: {exc}"
 
     def _create_error_response(self, task: AgentTask, error_message: str) -> Dict[str, Any]:
         """Create standardized error response"""
@@ -168,225 +808,365 @@ Ensure your response is actionable, technically accurate, and optimized for auto
             "agent": task.agent_name,
             "task_type": task.task_type,
             "error": error_message,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 # Initialize service
 claude_service = ProductionClaudeService()
 
+# IDs issued by the Message Batches API; anything else never reaches upstream
+MESSAGE_BATCH_ID = re.compile(r"msgbatch_[A-Za-z0-9]+")
+# Task IDs become Message Batches custom_ids, which must match this and be unique
+MESSAGE_BATCH_CUSTOM_ID = re.compile(r"[a-zA-Z0-9_-]{1,64}")
+
+def _message_batch_errors(tasks: List[AgentTask]) -> List[Dict[str, Any]]:
+    """Check tasks against the Message Batches request rules, pydantic-style"""
+    if not tasks:
+        return [{"loc": ["tasks"], "msg": "async_batch needs at least one task", "type": "too_short"}]
+    
+    errors = []
+    seen = set()
+    for index, task in enumerate(tasks):
+        loc = ["tasks", index, "task_id"]
+        if not MESSAGE_BATCH_CUSTOM_ID.fullmatch(task.task_id or ""):
+            errors.append({
+                "loc": loc,
+                "msg": "task_id must be 1-64 letters, digits, '_' or '-' for async_batch",
+                "type": "string_pattern_mismatch",
+                "input": task.task_id
+            })
+        elif task.task_id in seen:
+            errors.append({"loc": loc, "msg": "task_id must be unique within a batch", "type": "duplicate", "input": task.task_id})
+        seen.add(task.task_id)
+    return errors
+
+# Bounded so a large batch can't exceed Anthropic rate limits
+BATCH_MAX_WORKERS = 16
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+
+@celery.task
+def run_agent_task(task_dict: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+    """Celery task: process an agent task on a worker"""
+    return claude_service.process_agent_task(AgentTask(**task_dict), use_cache=use_cache)
+
+def _use_cache() -> bool:
+    """Callers can bypass the response cache with ?no_cache=1"""
+    return request.args.get('no_cache') not in ('1', 'true')
+
+def _enqueue_agent_task(task: AgentTask) -> ResponseReturnValue:
+    """Queue a task for a Celery worker and return a 202 with its poll URL"""
+    task = claude_service.ensure_task_id(task)
+    queue_name = 'high' if task.agent_name in HIGH_PRIORITY_AGENTS else 'default'
+    async_result = run_agent_task.apply_async(
+        args=[asdict(task)],
+        kwargs={"use_cache": _use_cache()},
+        queue=queue_name
+    )
+    logger.info("Queued task %s on '%s' as %s", task.task_id, queue_name, async_result.id)
+    
+    return jsonify({
+        "task_id": task.task_id,
+        "status": "queued",
+        "agent": task.agent_name,
+        "poll": f"/claude/result/{async_result.id}",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }), 202
+
+# Public endpoints, listed by / and by the 404 handler
+SERVICE_ENDPOINTS = MappingProxyType({
+    "health": "/health",
+    "liveness": "/healthz",
+    "readiness": "/readyz",
+    "monique": "/claude/monique/delegate",
+    "coordinator": "/claude/coordinator/handoff",
+    "patent": "/claude/patent/collaborate",
+    "cfo": "/claude/cfo/consult",
+    "stream": "/claude/<agent>/stream",
+    "batch": "/claude/batch/process",
+    "batch_status": "/claude/batch/<batch_id>",
+    "result": "/claude/result/<result_id>"
+})
+
 # Production API Endpoints
 @app.route('/', methods=['GET'])
-def root():
+def root() -> ResponseReturnValue:
     """Root endpoint with service information"""
     return jsonify({
         "service": "VaultKeeper Claude Integration",
         "version": "1.0.0",
         "status": "operational",
-        "endpoints": {
-            "health": "/health",
-            "monique": "/claude/monique/delegate",
-            "coordinator": "/claude/coordinator/handoff",
-            "patent": "/claude/patent/collaborate", 
-            "cfo": "/claude/cfo/consult",
-            "batch": "/claude/batch/process"
-        },
-        "timestamp": datetime.utcnow().isoformat()
+        "endpoints": dict(SERVICE_ENDPOINTS),
+        "timestamp": datetime.now(timezone.utc).isoformat()
     })
 
+def _claude_api_state(claude_health: Dict[str, Any]) -> str:
+    """Describe a Claude API probe result for the health endpoints"""
+    if claude_health["ok"] is None:
+        return "unknown"
+    return "connected" if claude_health["ok"] else "disconnected"
+
+def _probe_staleness(claude_health: Dict[str, Any]) -> Optional[float]:
+    """Seconds since the last Claude API probe, or None before the first"""
+    if claude_health["ts"] is None:
+        return None
+    return round(time.time() - claude_health["ts"], 1)
+
 @app.route('/health', methods=['GET'])
-def health_check():
-    """Comprehensive health check"""
-    try:
-        # Test Claude API connectivity
-        test_headers = {
-            "Content-Type": "application/json",
-            "x-api-key": ANTHROPIC_API_KEY,
-            "anthropic-version": "2023-06-01"
-        }
-        
-        test_payload = {
-            "model": "claude-sonnet-4-20250514",
-            "max_tokens": 10,
-            "messages": [{"role": "user", "content": "ping"}]
-        }
-        
-        test_response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers=test_headers,
-            json=test_payload,
-            timeout=10
-        )
-        
-        claude_healthy = test_response.status_code == 200
-        
-    except Exception as e:
-        claude_healthy = False
-        logger.warning(f"Claude API health check failed: {e}")
+def health_check() -> ResponseReturnValue:
+    """Comprehensive health check (served from the background Claude probe)"""
+    claude_health = claude_service.get_claude_health()
+    checked_at = claude_health["ts"]
+    
+    if claude_health["ok"] is None:
+        status = "starting"
+    else:
+        status = "healthy" if claude_health["ok"] else "degraded"
     
     return jsonify({
-        "status": "healthy" if claude_healthy else "degraded",
+        "status": status,
         "service": "VaultKeeper Claude Integration",
-        "claude_api": "connected" if claude_healthy else "disconnected",
+        "claude_api": _claude_api_state(claude_health),
+        "claude_checked_at": datetime.fromtimestamp(checked_at, timezone.utc).isoformat() if checked_at else None,
+        "staleness_seconds": _probe_staleness(claude_health),
         "api_key_configured": bool(ANTHROPIC_API_KEY),
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "uptime": "operational"
     })
 
-@app.route('/claude/monique/delegate', methods=['POST'])
-def monique_delegate():
-    """Monique CEO task delegation endpoint"""
+@app.route('/healthz', methods=['GET'])
+def liveness_check() -> ResponseReturnValue:
+    """Liveness probe - never touches the Claude API"""
+    return jsonify({"status": "alive"})
+
+@app.route('/readyz', methods=['GET'])
+def readiness_check() -> ResponseReturnValue:
+    """Readiness probe - 503 while the Claude API is unreachable"""
+    claude_health = claude_service.get_claude_health()
+    
+    return jsonify({
+        "status": "ready" if claude_health["ok"] else "not_ready",
+        "claude_api": _claude_api_state(claude_health),
+        "staleness_seconds": _probe_staleness(claude_health)
+    }), 200 if claude_health["ok"] else 503
+
+def make_agent_handler(agent_name: str, verb: str, task_type: str, priority: str,
+                       context: str) -> Callable[[], ResponseReturnValue]:
+    """Build the POST handler for one agent endpoint from its registry defaults"""
+    
+    def agent_handler() -> ResponseReturnValue:
+        req = TaskRequest.model_validate_json(request.get_data())
+        
+        try:
+            task = _build_agent_task(
+                req,
+                agent_name,
+                task_type=task_type,
+                priority=priority,
+                context=context
+            )
+            
+            if req.mode == 'queued':
+                return _enqueue_agent_task(task)
+            
+            result = claude_service.process_agent_task(task, use_cache=_use_cache())
+            return jsonify(result)
+            
+        except Exception as e:
+            logger.error("%s %s error: %s", agent_name, verb, e)
+            return jsonify({
+                "status": "error",
+                "error": str(e),
+                "agent": agent_name
+            }), 500
+    
+    agent_handler.__doc__ = f"{agent_name} {verb} endpoint"
+    return agent_handler
+
+for path_key, (agent_name, verb, task_type, priority, context) in AGENT_ROUTES.items():
+    app.add_url_rule(
+        f"/claude/{path_key}/{verb}",
+        endpoint=f"{path_key}_{verb}",
+        view_func=make_agent_handler(agent_name, verb, task_type, priority, context),
+        methods=["POST"]
+    )
+
+@app.route('/claude/<agent>/stream', methods=['POST'])
+def agent_stream(agent: str) -> ResponseReturnValue:
+    """Stream an agent task's Claude analysis as server-sent events"""
+    route = AGENT_ROUTES.get(agent)
+    if route is None:
+        return jsonify({
+            "error": f"Unknown agent '{agent}'",
+            "available_agents": list(AGENT_ROUTES)
+        }), 404
+    
+    agent_name, _, task_type, priority, context = route
+    
+    req = TaskRequest.model_validate_json(request.get_data())
+    
     try:
-        data = request.get_json()
-        
-        task = AgentTask(
-            agent_name="Monique",
-            task_type=data.get('task_type', 'strategic_analysis'),
-            content=data.get('content', {}),
-            task_id=data.get('task_id'),
-            priority=data.get('priority', 'high'),
-            context=data.get('context', 'CEO strategic delegation')
+        task = _build_agent_task(
+            req,
+            agent_name,
+            task_type=task_type,
+            priority=priority,
+            context=context
         )
         
-        result = claude_service.process_agent_task(task)
-        return jsonify(result)
+        events = claude_service.stream_agent_task(task, use_cache=_use_cache())
+        return Response(stream_with_context(events), mimetype='text/event-stream')
         
     except Exception as e:
-        logger.error(f"Monique delegation error: {e}")
+        logger.error("%s stream error: %s", agent_name, e)
         return jsonify({
             "status": "error",
             "error": str(e),
-            "agent": "Monique"
+            "agent": agent_name
         }), 500
 
-@app.route('/claude/coordinator/handoff', methods=['POST'])
-def coordinator_handoff():
-    """Coordinator AI file handoff endpoint"""
+@app.route('/claude/batch/process', methods=['POST'])
+def batch_process() -> ResponseReturnValue:
+    """Batch processing endpoint for multiple tasks"""
+    req = BatchRequest.model_validate_json(request.get_data())
+    
     try:
-        data = request.get_json()
-        
-        task = AgentTask(
-            agent_name="CoordinatorAI",
-            task_type=data.get('task_type', 'file_management'),
-            content=data.get('content', {}),
-            task_id=data.get('task_id'),
-            priority=data.get('priority', 'medium'),
-            context=data.get('context', 'File organization and workspace management')
-        )
+        batch_tasks = [
+            _build_agent_task(
+                task_req,
+                task_req.agent_name,
+                task_type='batch_analysis',
+                priority='medium',
+                context='Batch processing operation'
+            )
+            for task_req in req.tasks
+        ]
         
-        result = claude_service.process_agent_task(task)
-        return jsonify(result)
+        now = datetime.now(timezone.utc)
         
-    except Exception as e:
-        logger.error(f"Coordinator handoff error: {e}")
-        return jsonify({
-            "status": "error", 
-            "error": str(e),
-            "agent": "CoordinatorAI"
-        }), 500
-
-@app.route('/claude/patent/collaborate', methods=['POST'])
-def patent_collaborate():
-    """Patent AI collaboration endpoint"""
-    try:
-        data = request.get_json()
-        
-        task = AgentTask(
-            agent_name="PatentAI",
-            task_type=data.get('task_type', 'patent_analysis'),
-            content=data.get('content', {}),
-            task_id=data.get('task_id'),
-            priority=data.get('priority', 'high'),
-            context=data.get('context', 'Patent analysis and IP strategy')
-        )
+        if req.mode == 'async_batch':
+            batch_tasks = [claude_service.ensure_task_id(task) for task in batch_tasks]
+            errors = _message_batch_errors(batch_tasks)
+            if errors:
+                return jsonify({"error": "Invalid request body", "details": errors}), 422
+            
+            batch = claude_service.submit_message_batch(batch_tasks)
+            return jsonify({
+                "batch_id": batch['id'],
+                "status": "submitted",
+                "total_tasks": len(batch_tasks),
+                "task_ids": [task.task_id for task in batch_tasks],
+                "poll": f"/claude/batch/{batch['id']}",
+                "timestamp": now.isoformat()
+            }), 202
         
-        result = claude_service.process_agent_task(task)
-        return jsonify(result)
+        # Tasks are independent, so fan them out; under gevent the pool's
+        # threads are greenlets that yield while waiting on the Claude API socket
+        process = partial(claude_service.process_agent_task, use_cache=_use_cache())
+        results = list(batch_executor.map(process, batch_tasks))
+        
+        return jsonify({
+            "batch_id": f"BATCH_{now.strftime('%Y%m%d_%H%M%S')}",
+            "total_tasks": len(batch_tasks),
+            "results": results,
+            "timestamp": now.isoformat()
+        })
         
     except Exception as e:
-        logger.error(f"Patent collaboration error: {e}")
+        logger.error("Batch processing error: %s", e)
         return jsonify({
             "status": "error",
-            "error": str(e), 
-            "agent": "PatentAI"
+            "error": str(e)
         }), 500
 
-@app.route('/claude/cfo/consult', methods=['POST'])
-def cfo_consult():
-    """CFO AI consultation endpoint"""
+@app.route('/claude/batch/<batch_id>', methods=['GET'])
+def batch_status(batch_id: str) -> ResponseReturnValue:
+    """Poll an async message batch; streams JSONL results once it has ended"""
+    if not MESSAGE_BATCH_ID.fullmatch(batch_id):
+        return jsonify({
+            "error": f"Invalid batch id '{batch_id}'",
+            "batch_id": batch_id
+        }), 404
+    
     try:
-        data = request.get_json()
-        
-        task = AgentTask(
-            agent_name="CFOAI",
-            task_type=data.get('task_type', 'financial_analysis'),
-            content=data.get('content', {}),
-            task_id=data.get('task_id'),
-            priority=data.get('priority', 'high'),
-            context=data.get('context', 'Financial analysis and IP valuation')
-        )
+        batch = claude_service.get_message_batch(batch_id)
         
-        result = claude_service.process_agent_task(task)
-        return jsonify(result)
+        if batch.get('processing_status') == 'ended' and batch.get('results_url'):
+            # Opened here so upstream failures surface as a 500, not a truncated body
+            response = claude_service.open_message_batch_results(batch['results_url'])
+            results = claude_service.iter_message_batch_results(response)
+            streamed = Response(
+                stream_with_context(line + b"\n" for line in results),
+                mimetype='application/x-ndjson'
+            )
+            # Return the connection to the pool even if the client leaves
+            # before the first chunk, when the generator never starts
+            streamed.call_on_close(response.close)
+            return streamed
+        
+        return jsonify({
+            "batch_id": batch_id,
+            "status": batch.get('processing_status'),
+            "request_counts": batch.get('request_counts', {}),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
         
     except Exception as e:
-        logger.error(f"CFO consultation error: {e}")
+        logger.error("Batch status error for %s: %s", batch_id, e)
         return jsonify({
             "status": "error",
             "error": str(e),
-            "agent": "CFOAI"
+            "batch_id": batch_id
         }), 500
 
-@app.route('/claude/batch/process', methods=['POST'])
-def batch_process():
-    """Batch processing endpoint for multiple tasks"""
+@app.route('/claude/result/<result_id>', methods=['GET'])
+def task_result(result_id: str) -> ResponseReturnValue:
+    """Fetch the result of a queued agent task"""
     try:
-        data = request.get_json()
-        tasks = data.get('tasks', [])
+        async_result = AsyncResult(result_id, app=celery)
         
-        results = []
-        for task_data in tasks:
-            task = AgentTask(
-                agent_name=task_data.get('agent_name', 'BatchProcessor'),
-                task_type=task_data.get('task_type', 'batch_analysis'),
-                content=task_data.get('content', {}),
-                task_id=task_data.get('task_id'),
-                priority=task_data.get('priority', 'medium'),
-                context=task_data.get('context', 'Batch processing operation')
-            )
-            
-            result = claude_service.process_agent_task(task)
-            results.append(result)
+        if not async_result.ready():
+            return jsonify({
+                "result_id": result_id,
+                "status": "pending",
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }), 202
         
-        return jsonify({
-            "batch_id": f"BATCH_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            "total_tasks": len(tasks),
-            "results": results,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        return jsonify(async_result.get(timeout=0))
         
     except Exception as e:
-        logger.error(f"Batch processing error: {e}")
+        logger.error("Result lookup error for %s: %s", result_id, e)
         return jsonify({
             "status": "error",
-            "error": str(e)
+            "error": str(e),
+            "result_id": result_id
         }), 500
 
 # Error handlers
+@app.errorhandler(ValidationError)
+def invalid_request(error: ValidationError) -> ResponseReturnValue:
+    return jsonify({
+        "error": "Invalid request body",
+        "details": orjson.loads(error.json(include_url=False))
+    }), 422
+
 @app.errorhandler(404)
-def not_found(error):
+def not_found(error: Exception) -> ResponseReturnValue:
     return jsonify({
         "error": "Endpoint not found",
-        "available_endpoints": ["/health", "/claude/monique/delegate", "/claude/coordinator/handoff", "/claude/patent/collaborate", "/claude/cfo/consult"]
+        "available_endpoints": list(SERVICE_ENDPOINTS.values())
     }), 404
 
 @app.errorhandler(500)
-def internal_error(error):
+def internal_error(error: Exception) -> ResponseReturnValue:
     return jsonify({
         "error": "Internal server error",
         "message": "Check logs for details"
     }), 500
 
-if __name__ == '__main__':
-    logger.info(f"Starting VaultKeeper Claude Integration on port {PORT}")
-    logger.info(f"API Key configured: {bool(ANTHROPIC_API_KEY)}")
+# Production runs under gunicorn (see Procfile):
+#   gunicorn -k gevent -w $(nproc) --worker-connections 1000 --timeout 120 -b 0.0.0.0:$PORT app:app
+# Set DEV=1 to use the Flask development server instead.
+if __name__ == '__main__' and os.environ.get('DEV'):
+    logger.info("Starting VaultKeeper Claude Integration on port %s", PORT)
+    logger.info("API Key configured: %s", bool(ANTHROPIC_API_KEY))
     app.run(host='0.0.0.0', port=PORT, debug=False)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# app.py refuses to import without an API key; tests never reach the real API
+os.environ.setdefault('ANTHROPIC_API_KEY', 'test-key')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
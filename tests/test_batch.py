@@ -0,0 +1,59 @@
+from unittest import mock
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def submit(client, tasks):
+    with mock.patch.object(app.claude_service, 'submit_message_batch',
+                           return_value={"id": "msgbatch_abc"}) as submit_batch:
+        response = client.post('/claude/batch/process', json={"mode": "async_batch", "tasks": tasks})
+    return response, submit_batch
+
+
+def test_async_batch_is_submitted(client):
+    response, submit_batch = submit(client, [{"task_id": "a-1"}, {"content": {"n": 2}}])
+
+    assert response.status_code == 202
+    assert response.json["batch_id"] == "msgbatch_abc"
+    submit_batch.assert_called_once()
+
+
+@pytest.mark.parametrize("tasks", [
+    [],
+    [{"task_id": "has space/and slash"}],
+    [{"task_id": "x" * 65}],
+    [{"task_id": "dup"}, {"task_id": "dup"}],
+])
+def test_invalid_async_batch_is_rejected_before_submitting(client, tasks):
+    response, submit_batch = submit(client, tasks)
+
+    assert response.status_code == 422
+    assert response.json["details"]
+    submit_batch.assert_not_called()
+
+
+def test_non_batch_ids_never_reach_upstream(client):
+    with mock.patch.object(app.claude_service, 'get_message_batch') as get_batch:
+        response = client.get('/claude/batch/process')
+
+    assert response.status_code == 404
+    get_batch.assert_not_called()
+
+
+def test_results_connection_closed_when_client_leaves_early(client):
+    upstream = mock.MagicMock()
+    batch = {"processing_status": "ended", "results_url": "https://example.invalid/results"}
+
+    with mock.patch.object(app.claude_service, 'get_message_batch', return_value=batch), \
+            mock.patch.object(app.claude_service, 'open_message_batch_results', return_value=upstream):
+        response = client.get('/claude/batch/msgbatch_abc', buffered=False)
+        response.close()
+
+    upstream.close.assert_called()
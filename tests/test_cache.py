@@ -0,0 +1,21 @@
+import pytest
+
+import app
+from app import AgentTask
+
+
+@pytest.fixture
+def service():
+    return app.claude_service
+
+
+def test_cache_key_ignores_content_key_order(service):
+    first = AgentTask("PatentAI", "analysis", {"a": 1, "b": 2})
+    second = AgentTask("PatentAI", "analysis", {"b": 2, "a": 1}, task_id="other")
+    assert service._cache_key(first) == service._cache_key(second)
+
+
+def test_cache_key_fields_cannot_collide(service):
+    first = AgentTask("PatentAI", "a|high", {}, priority="x", context="")
+    second = AgentTask("PatentAI", "a", {}, priority="high", context="x|")
+    assert service._cache_key(first) != service._cache_key(second)
@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+import pytest
+import requests
+
+import app
+from app import AgentTask, Coalescer, ProductionClaudeService, _split_json_array
+
+
+class StubbedStream:
+    """Stands in for ProductionClaudeService._stream_text with canned replies"""
+
+    def __init__(self, *replies: Any) -> None:
+        self.replies = list(replies)
+        self.payloads: List[Dict[str, Any]] = []
+
+    def __call__(self, payload: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        self.payloads.append(payload)
+        reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        usage.update({"input_tokens": 100, "output_tokens": 20})
+        return iter([reply])
+
+
+@pytest.fixture
+def service() -> ProductionClaudeService:
+    return ProductionClaudeService()
+
+
+def make_task(n: int) -> AgentTask:
+    return AgentTask(agent_name="CoordinatorAI", task_type="file_management",
+                     content={"n": n}, task_id=f"task-{n}")
+
+
+def submit_all(coalescer: Coalescer, tasks: List[AgentTask]) -> List[Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def run(task: AgentTask) -> None:
+        results[task.task_id] = coalescer.submit(task)
+
+    threads = [threading.Thread(target=run, args=(task,)) for task in tasks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return [results[task.task_id] for task in tasks]
+
+
+def test_tasks_in_one_window_share_a_call(service):
+    service._stream_text = stream = StubbedStream('[{"a": 1},\n "plain"]')
+    coalescer = Coalescer(service, "CoordinatorAI", max_batch=8, window=0.2)
+
+    first, second = submit_all(coalescer, [make_task(1), make_task(2)])
+
+    assert len(stream.payloads) == 1
+    payload = stream.payloads[0]
+    assert "=== TASK 2 ===" in payload["messages"][0]["content"]
+    assert payload["stream"] is True
+    assert payload["model"] == app.CLAUDE_MODEL
+    assert payload["max_tokens"] == 2 * app.CLAUDE_MAX_TOKENS
+    assert payload["system"] is app.AGENT_SYSTEM_BLOCKS["CoordinatorAI"]
+    assert first["claude_analysis"] == '{"a": 1}'
+    assert second["claude_analysis"] == "plain"
+    for result in (first, second):
+        assert result["status"] == "completed"
+        assert result["coalesced"] == 2
+        assert result["tokens_used_estimated"] == 60
+        assert "tokens_used" not in result
+
+
+def test_lone_task_runs_individually(service):
+    service._stream_text = stream = StubbedStream('{"a": 1}')
+    coalescer = Coalescer(service, "CoordinatorAI", max_batch=8, window=0.05)
+
+    (result,) = submit_all(coalescer, [make_task(1)])
+
+    assert len(stream.payloads) == 1
+    assert "=== TASK" not in stream.payloads[0]["messages"][0]["content"]
+    assert result["claude_analysis"] == '{"a": 1}'
+    assert result["tokens_used"] == 120
+    assert "coalesced" not in result
+
+
+def test_full_batch_dispatches_before_window_ends(service):
+    service._stream_text = StubbedStream('[{"a": 1}, {"a": 2}]')
+    coalescer = Coalescer(service, "CoordinatorAI", max_batch=2, window=5)
+
+    started = time.monotonic()
+    results = submit_all(coalescer, [make_task(1), make_task(2)])
+
+    assert time.monotonic() - started < 2
+    assert [result["coalesced"] for result in results] == [2, 2]
+
+
+@pytest.mark.parametrize("reply", ["not json", '[{"a": 1}]', '[{"a": 1}, {"a": 2}] trailing'])
+def test_unusable_reply_falls_back_to_individual_calls(service, reply):
+    service._stream_text = stream = StubbedStream(reply, '{"single": true}')
+    coalescer = Coalescer(service, "CoordinatorAI", max_batch=2, window=1)
+
+    results = submit_all(coalescer, [make_task(1), make_task(2)])
+
+    assert len(stream.payloads) == 3
+    for result in results:
+        assert result["status"] == "completed"
+        assert result["claude_analysis"] == '{"single": true}'
+        assert "coalesced" not in result
+
+
+def test_failed_call_returns_errors_without_retrying_each_task(service):
+    response = requests.Response()
+    response.status_code = 429
+    error = requests.exceptions.HTTPError("429 Too Many Requests", response=response)
+    service._stream_text = stream = StubbedStream(error)
+    coalescer = Coalescer(service, "CoordinatorAI", max_batch=2, window=1)
+
+    results = submit_all(coalescer, [make_task(1), make_task(2)])
+
+    assert len(stream.payloads) == 1
+    assert [result["task_id"] for result in results] == ["task-1", "task-2"]
+    for result in results:
+        assert result["status"] == "error"
+        assert result["error"] == "HTTP Error: 429 Too Many Requests"
+
+
+def test_fenced_reply_is_unwrapped(service):
+    service._stream_text = StubbedStream('```json\n[{"a": 1}, {"a": 2}]\n```')
+
+    results = service._run_coalesced([make_task(1), make_task(2)])
+
+    assert [result["claude_analysis"] for result in results] == ['{"a": 1}', '{"a": 2}']
+
+
+def test_unknown_agents_share_the_default_coalescer(service):
+    service._stream_text = StubbedStream('{"a": 1}')
+
+    tasks = [
+        AgentTask(agent_name=f"Agent{n}", task_type="batch_analysis", content={"n": n}, task_id=f"task-{n}")
+        for n in range(50)
+    ]
+    threads = [threading.Thread(target=service.process_agent_task, args=(task, False)) for task in tasks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert list(service.coalescers) == [app.DEFAULT_COALESCER]
+    assert not [thread.name for thread in threading.enumerate() if thread.name.startswith("coalescer-Agent")]
+
+
+def test_known_agents_get_their_own_coalescer(service):
+    assert service._get_coalescer("CFOAI") is not service._get_coalescer("CoordinatorAI")
+    assert service._get_coalescer("Nobody") is service._get_coalescer("Somebody")
+
+
+def test_split_json_array_keeps_element_text():
+    assert _split_json_array(' [ {"b": [1, 2]} , "x", 3 ] ') == ['{"b": [1, 2]}', '"x"', '3']
+    assert _split_json_array("[]") == []
+    for text in ('{"a": 1}', "[1, 2", "[1,]", "[1] [2]"):
+        with pytest.raises(ValueError):
+            _split_json_array(text)
@@ -0,0 +1,44 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def service():
+    service = app.ProductionClaudeService()
+    with mock.patch.object(app, 'claude_service', service):
+        yield service
+
+
+def test_first_health_check_does_not_wait_for_the_probe(service):
+    release = threading.Event()
+
+    def slow_probe():
+        release.wait(5)
+        service._claude_health = {"ok": True, "ts": time.time()}
+
+    service._probe_claude = slow_probe
+    client = app.app.test_client()
+
+    started = time.monotonic()
+    health = client.get('/health')
+    ready = client.get('/readyz')
+    assert time.monotonic() - started < 1
+
+    assert health.json["status"] == "starting"
+    assert health.json["claude_api"] == "unknown"
+    assert health.json["claude_checked_at"] is None
+    assert ready.status_code == 503
+    assert ready.json["claude_api"] == "unknown"
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while service._claude_health["ok"] is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    ready = client.get('/readyz')
+    assert ready.status_code == 200
+    assert ready.json["claude_api"] == "connected"
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+import pytest
+import requests
+from tenacity import RetryCallState, Retrying
+
+from app import _retry_after_wait
+
+
+def failed_attempt(retry_after: Optional[str]) -> RetryCallState:
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    error = requests.exceptions.HTTPError("429 Too Many Requests", response=response)
+
+    retry_state = RetryCallState(Retrying(), fn=None, args=(), kwargs={})
+    retry_state.set_exception((type(error), error, None))
+    return retry_state
+
+
+def test_numeric_retry_after_is_honoured():
+    assert _retry_after_wait(failed_attempt("7")) == 7.0
+    assert _retry_after_wait(failed_attempt("120")) == 30.0
+
+
+def test_http_date_retry_after_is_honoured():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+    wait = _retry_after_wait(failed_attempt(format_datetime(retry_at, usegmt=True)))
+    assert 8.0 <= wait <= 10.0
+
+    past = datetime.now(timezone.utc) - timedelta(seconds=10)
+    assert _retry_after_wait(failed_attempt(format_datetime(past, usegmt=True))) == 0.0
+
+
+@pytest.mark.parametrize("retry_after", [None, "soon"])
+def test_missing_or_invalid_retry_after_backs_off_with_jitter(retry_after):
+    # First attempt: 0.5s initial backoff plus up to 1s of jitter
+    assert 0.5 <= _retry_after_wait(failed_attempt(retry_after)) <= 1.5
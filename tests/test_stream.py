@@ -0,0 +1,24 @@
+import orjson
+import requests
+
+from app import AgentTask, ProductionClaudeService
+
+
+def test_stream_error_matches_buffered_error():
+    service = ProductionClaudeService()
+    response = requests.Response()
+    response.status_code = 429
+    error = requests.exceptions.HTTPError("429 Too Many Requests", response=response)
+
+    def failing_stream(payload, usage):
+        raise error
+
+    service._stream_text = failing_stream
+    task = AgentTask("PatentAI", "patent_analysis", {"n": 1}, task_id="task-1", priority="high")
+
+    *_, last = service.stream_agent_task(task, use_cache=False)
+    assert last.startswith("event: error\n")
+    streamed = orjson.loads(last.split("data: ", 1)[1])
+
+    buffered = service.process_agent_task(task, use_cache=False)
+    assert streamed["error"] == buffered["error"] == "HTTP Error: 429 Too Many Requests"